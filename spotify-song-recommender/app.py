@@ -5,15 +5,25 @@ import sys
 import time
 import json
 import base64
+import functools
 import urllib.parse
-import urllib.request
-import urllib.error
 import pathlib
 import re
+import threading
 import unicodedata
-from typing import List, Tuple, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, List, NamedTuple, Tuple, Dict, Optional
 
+import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads  # stdlib also takes the raw bytes
 
 # ---------- Page / Branding ----------
 st.set_page_config(page_title="Song Recommendation (Spotify)", page_icon="🎵")
@@ -22,8 +32,10 @@ st.caption("Each item includes an 'Open in Spotify' button for attribution.")
 st.caption("Tip: typos are okay — we’ll fuzzy‑match your Title and Artist.")
 
 # ---------- Secrets ----------
+@st.cache_resource(show_spinner=False)
 def _get_secret(name: str) -> str:
-    # Prefer Streamlit secrets; fall back to environment variables
+    # Prefer Streamlit secrets; fall back to environment variables.
+    # cache_resource (unlike a module-level memo) survives reruns, so this runs once per process.
     val = st.secrets.get(name, "") or os.getenv(name, "")
     return val.strip()
 
@@ -42,6 +54,29 @@ def link_button(label: str, url: str):
 # ---------- Spotify client (Client Credentials; allowed endpoints only) ----------
 SPOTIFY_TOKEN_URL = "https://accounts.spotify.com/api/token"
 SPOTIFY_API_BASE = "https://api.spotify.com/v1"
+ETAG_CACHE_MAX = 512  # revalidation entries kept per client
+# Only Get Artist / Get Several Artists are revalidated: their bodies are small, whereas
+# top-tracks responses are large and already slimmed and cached by _cached_top_tracks
+_ETAG_PATH = re.compile(r"/artists(?:/[^/?]+)?")
+RATE_LIMIT_PER_SEC = 10.0  # steady request rate per client
+RATE_LIMIT_BURST = 20.0  # bucket capacity
+
+@st.cache_resource(show_spinner=False)
+def _token_store() -> Tuple[Dict[str, Tuple[str, float]], threading.Lock]:
+    """Bearer tokens keyed by client id, plus the lock guarding them.
+
+    Streamlit re-executes this module on every rerun, so class or module globals are
+    rebuilt each time; a cache_resource value is what actually lives for the process.
+    """
+    return {}, threading.Lock()
+
+class TrackCore(NamedTuple):
+    """The track fields the recommenders use, pulled out once per track object."""
+    tid: str
+    tname: str
+    aid: str
+    aname: str
+    url: str
 
 class SpotifyClient:
     """
@@ -49,6 +84,7 @@ class SpotifyClient:
     Endpoints used:
       - GET /v1/search
       - GET /v1/artists/{id}
+      - GET /v1/artists?ids=... (up to 50 per request)
       - GET /v1/artists/{id}/top-tracks (requires `market`)
       - GET /v1/artists/{id}/related-artists
     """
@@ -57,63 +93,106 @@ class SpotifyClient:
         self.client_id = (client_id or "").strip()
         self.client_secret = (client_secret or "").strip()
         self.market = (market or "US").upper()
-        self._access_token: Optional[str] = None
-        self._expires_at: float = 0.0
+        # One keep-alive connection pool for every token/search/artist call
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=20))
+        # Last ETag + parsed body per artist URL (see _ETAG_PATH), for If-None-Match revalidation
+        self._etags: Dict[str, Tuple[str, Dict]] = {}
+        self._etag_lock = threading.Lock()
+        # Token bucket pacing outgoing API calls
+        self._bucket_tokens = RATE_LIMIT_BURST
+        self._bucket_ts = time.monotonic()
+        self._bucket_lock = threading.Lock()
 
     # --- Auth: Client Credentials ---
-    def _fetch_access_token(self) -> None:
+    def _fetch_access_token(self) -> str:
         """Obtain a ~1-hour bearer token via Client Credentials."""
         basic = base64.b64encode(f"{self.client_id}:{self.client_secret}".encode("utf-8")).decode("utf-8")
-        data = urllib.parse.urlencode({"grant_type": "client_credentials"}).encode("utf-8")
-        req = urllib.request.Request(
+        resp = self._session.post(
             SPOTIFY_TOKEN_URL,
-            data=data,
+            data={"grant_type": "client_credentials"},
             headers={"Authorization": f"Basic {basic}", "Content-Type": "application/x-www-form-urlencoded"},
-            method="POST",
+            timeout=15,
         )
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            payload = json.loads(resp.read().decode("utf-8"))
-            self._access_token = payload["access_token"]
-            # Refresh slightly early (95% of expires_in)
-            self._expires_at = time.time() + float(payload.get("expires_in", 3600)) * 0.95
+        resp.raise_for_status()
+        payload = _json_loads(resp.content)
+        token = payload["access_token"]
+        # Refresh 60s before expiry
+        expires_at = time.time() + float(payload.get("expires_in", 3600)) - 60.0
+        _token_store()[0][self.client_id] = (token, expires_at)
+        return token
 
     def _ensure_token(self) -> str:
-        if not self._access_token or time.time() >= self._expires_at:
-            self._fetch_access_token()
-        return self._access_token
+        # Lock so concurrent first use from worker threads fetches only one token
+        tokens, lock = _token_store()
+        with lock:
+            cached = tokens.get(self.client_id)
+            if cached and time.time() < cached[1]:
+                return cached[0]
+            return self._fetch_access_token()
+
+    def _throttle(self) -> None:
+        """Take one token from the bucket, sleeping if the client is ahead of RATE_LIMIT_PER_SEC."""
+        with self._bucket_lock:
+            now = time.monotonic()
+            self._bucket_tokens = min(RATE_LIMIT_BURST, self._bucket_tokens + (now - self._bucket_ts) * RATE_LIMIT_PER_SEC)
+            self._bucket_ts = now
+            # Reserve the token now (possibly going into debt) so concurrent callers queue fairly
+            self._bucket_tokens -= 1.0
+            wait = -self._bucket_tokens / RATE_LIMIT_PER_SEC if self._bucket_tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
 
     # --- Core GET helper ---
-    def _api_get(self, path: str, params: Dict[str, str] = None) -> Dict:
+    def _api_get(self, path: str, params: Optional[Dict[str, str]] = None) -> Dict:
         """
-        Build a GET request to `SPOTIFY_API_BASE + path` with params and auth header.
+        GET `SPOTIFY_API_BASE + path` with params and auth header over the pooled session.
 
         Resilience:
           - If 429 Too Many Requests: sleep Retry-After, then retry once.
           - If 401 Unauthorized: refresh token and retry once.
+
+        Requests are paced by a token bucket so bursts rarely reach 429 in the first place.
+        Get Artist / Get Several Artists send If-None-Match with the last ETag; a 304 returns the stored body.
         """
         token = self._ensure_token()
         url = f"{SPOTIFY_API_BASE}{path}"
-        if params:
-            url += "?" + urllib.parse.urlencode(params)
+        headers = {"Authorization": f"Bearer {token}"}
+        etag_key = None
+        cached = None
+        if _ETAG_PATH.fullmatch(path):
+            etag_key = url + ("?" + urllib.parse.urlencode(params) if params else "")
+            cached = self._etags.get(etag_key)
+            if cached:
+                headers["If-None-Match"] = cached[0]
+        self._throttle()
+        resp = self._session.get(url, params=params or None, headers=headers, timeout=20)
+        if resp.status_code == 429:
+            retry_after = int(resp.headers.get("Retry-After", "2"))
+            time.sleep(retry_after)
+            self._throttle()
+            resp = self._session.get(url, params=params or None, headers=headers, timeout=20)
+        elif resp.status_code == 401:
+            with _token_store()[1]:
+                headers["Authorization"] = f"Bearer {self._fetch_access_token()}"
+            self._throttle()
+            resp = self._session.get(url, params=params or None, headers=headers, timeout=20)
+        if resp.status_code == 304 and cached:
+            return cached[1]
+        resp.raise_for_status()
+        data = _json_loads(resp.content)
+        etag = resp.headers.get("ETag")
+        if etag_key and etag:
+            with self._etag_lock:
+                self._etags.pop(etag_key, None)
+                if len(self._etags) >= ETAG_CACHE_MAX:
+                    self._etags.pop(next(iter(self._etags)))
+                self._etags[etag_key] = (etag, data)
+        return data
 
-        req = urllib.request.Request(url, headers={"Authorization": f"Bearer {token}"}, method="GET")
-        try:
-            with urllib.request.urlopen(req, timeout=20) as resp:
-                return json.loads(resp.read().decode("utf-8"))
-        except urllib.error.HTTPError as e:
-            if e.code == 429:
-                retry_after = int(e.headers.get("Retry-After", "2"))
-                time.sleep(retry_after)
-                with urllib.request.urlopen(req, timeout=20) as resp:
-                    return json.loads(resp.read().decode("utf-8"))
-            if e.code == 401:
-                self._fetch_access_token()
-                req = urllib.request.Request(
-                    url, headers={"Authorization": f"Bearer {self._access_token}"}, method="GET"
-                )
-                with urllib.request.urlopen(req, timeout=20) as resp:
-                    return json.loads(resp.read().decode("utf-8"))
-            raise
+    def _search(self, q: str, type_: str, limit: int, offset: int = 0) -> Dict:
+        """GET /v1/search through the shared Streamlit data cache."""
+        return _cached_search(self, self.market, q, type_, limit, offset)
 
     # --- Search helpers ---
     def search_track(self, title: str, artist: str, limit: int = 3) -> List[Dict]:
@@ -123,8 +202,7 @@ class SpotifyClient:
         if not t and not a:
             return []
         q = " ".join([f'track:"{t}"' if t else "", f'artist:"{a}"' if a else ""]).strip()
-        params = {"q": q, "type": "track", "limit": str(limit), "market": self.market}
-        data = self._api_get("/search", params)
+        data = self._search(q, "track", limit)
         return (data.get("tracks", {}) or {}).get("items", []) or []
 
     def search_tracks_filtered(self, title: str = "", artist: str = "", limit: int = 10) -> List[Dict]:
@@ -132,12 +210,12 @@ class SpotifyClient:
         results: List[Dict] = []
         q = " ".join([f'track:"{title.strip()}"' if title else "", f'artist:"{artist.strip()}"' if artist else ""]).strip()
         if q:
-            data = self._api_get("/search", {"q": q, "type": "track", "limit": str(limit), "market": self.market})
+            data = self._search(q, "track", limit)
             results = (data.get("tracks") or {}).get("items", []) or []
         if not results:
             q = " ".join([f"track:{title.strip()}" if title else "", f"artist:{artist.strip()}" if artist else ""]).strip()
             if q:
-                data = self._api_get("/search", {"q": q, "type": "track", "limit": str(limit), "market": self.market})
+                data = self._search(q, "track", limit)
                 results = (data.get("tracks") or {}).get("items", []) or []
         return results
 
@@ -146,23 +224,31 @@ class SpotifyClient:
         q = (query or "").strip()
         if not q:
             return []
-        data = self._api_get("/search", {"q": q, "type": "track", "limit": str(limit), "market": self.market})
+        data = self._search(q, "track", limit)
         return (data.get("tracks") or {}).get("items", []) or []
 
     # --- Artist data ---
     def get_artist(self, artist_id: str) -> Dict:
         """Get Artist (name, genres, popularity, images...)."""
-        return self._api_get(f"/artists/{artist_id}", {})
+        return _cached_get_artist(self, artist_id)
+
+    def get_artists_bulk(self, ids: List[str]) -> Dict[str, Dict]:
+        """Get Several Artists, batched 50 ids per request; returns {artist_id: artist}."""
+        out: Dict[str, Dict] = {}
+        for i in range(0, len(ids), 50):
+            data = _cached_get_artists(self, tuple(ids[i:i + 50]))
+            out.update({a["id"]: a for a in data.get("artists", []) or [] if a})
+        return out
 
     def get_artist_top_tracks(self, artist_id: str, limit: int = 10) -> List[Dict]:
         """Top Tracks (requires `market`)."""
-        data = self._api_get(f"/artists/{artist_id}/top-tracks", {"market": self.market})
+        data = _cached_top_tracks(self, self.market, artist_id)
         items = data.get("tracks", []) or []
         return items[:limit]
 
     def get_related_artists(self, artist_id: str) -> List[Dict]:
         """Related Artists."""
-        data = self._api_get(f"/artists/{artist_id}/related-artists", {})
+        data = self._api_get(f"/artists/{artist_id}/related-artists")
         return data.get("artists", []) or []
 
     def search_artists_by_genre(self, genre: str, limit: int = 10, offset: int = 0) -> List[Dict]:
@@ -171,71 +257,200 @@ class SpotifyClient:
         if not g:
             return []
         q = f'genre:"{g}"'
-        data = self._api_get("/search", {"q": q, "type": "artist", "limit": str(limit), "offset": str(offset), "market": self.market})
+        data = self._search(q, "artist", limit, offset)
         return (data.get("artists") or {}).get("items", []) or []
 
     # --- Track core extractor ---
     @staticmethod
-    def extract_track_core(track: Dict) -> Tuple[str, str, str, str, str]:
-        """Return (track_id, track_name, primary_artist_id, primary_artist_name, spotify_url)."""
+    def extract_track_core(track: Dict) -> TrackCore:
+        """Return TrackCore(track_id, track_name, primary_artist_id, primary_artist_name, spotify_url)."""
         tid = track.get("id") or ""
         tname = track.get("name") or ""
         artists = track.get("artists") or []
         a_id = artists[0].get("id") if artists else ""
         a_name = artists[0].get("name") if artists else ""
         turl = (track.get("external_urls") or {}).get("spotify") or (f"https://open.spotify.com/track/{tid}" if tid else "")
-        return tid, tname, a_id, a_name, turl
+        return TrackCore(tid, tname, a_id, a_name, turl)
+
+# ---------- Shared client ----------
+@st.cache_resource(show_spinner=False)
+def _get_spotify_client(client_id: str, client_secret: str, market: str) -> SpotifyClient:
+    """One client per (credentials, market) for the whole process, so its connection pool stays warm."""
+    return SpotifyClient(client_id, client_secret, market=market)
+
+# ---------- Cached API lookups ----------
+# Shared across reruns and sessions. The leading underscore keeps the client out of
+# Streamlit's cache key, so entries are keyed on market + lookup inputs only.
+@st.cache_data(ttl=3600, max_entries=2048, show_spinner=False)
+def _cached_search(_sp: SpotifyClient, market: str, q: str, type_: str, limit: int, offset: int = 0) -> Dict:
+    params = {"q": q, "type": type_, "limit": str(limit), "market": market}
+    if offset:
+        params["offset"] = str(offset)
+    return _sp._api_get("/search", params)
+
+@st.cache_data(ttl=3600, max_entries=2048, show_spinner=False)
+def _cached_get_artist(_sp: SpotifyClient, artist_id: str) -> Dict:
+    return _sp._api_get(f"/artists/{artist_id}")
+
+@st.cache_data(ttl=3600, max_entries=2048, show_spinner=False)
+def _cached_get_artists(_sp: SpotifyClient, artist_ids: Tuple[str, ...]) -> Dict:
+    return _sp._api_get("/artists", {"ids": ",".join(artist_ids)})
+
+# Track fields kept in cached top-tracks payloads (album, preview, ids... are dropped)
+TOP_TRACK_FIELDS = ("id", "name", "popularity", "artists", "external_urls")
+
+def _slim_track(track: Dict) -> Dict:
+    slim = {k: track[k] for k in TOP_TRACK_FIELDS if k in track}
+    slim["artists"] = [{"id": a.get("id"), "name": a.get("name")} for a in track.get("artists") or []]
+    return slim
+
+@functools.lru_cache(maxsize=64)
+def _market_query(market: str) -> str:
+    """Query string for market-only endpoints (top-tracks)."""
+    return "?" + urllib.parse.urlencode({"market": market})
+
+@st.cache_data(ttl=3600, max_entries=2048, show_spinner=False)
+def _cached_top_tracks(_sp: SpotifyClient, market: str, artist_id: str) -> Dict:
+    # Build the URL from `market`, the cache key, not from the (unhashed) client
+    data = _sp._api_get(f"/artists/{artist_id}/top-tracks{_market_query(market)}")
+    return {"tracks": [_slim_track(tr) for tr in data.get("tracks", []) or [] if tr]}
 
 # ---------- Fuzzy helpers ----------
+def _levenshtein(a: str, b: str) -> int:
+    """Edit distance via Myers/Hyyrö bit-parallel algorithm (one int bitmask per char of `a`)."""
+    if not a:
+        return len(b)
+    if not b:
+        return len(a)
+    peq: Dict[str, int] = {}
+    for i, ch in enumerate(a):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    mask = (1 << len(a)) - 1
+    high = 1 << (len(a) - 1)
+    vp, vn, dist = mask, 0, len(a)
+    for ch in b:
+        eq = peq.get(ch, 0)
+        xv = eq | vn
+        xh = (((eq & vp) + vp) ^ vp) | eq
+        hp = vn | ~(xh | vp)
+        hn = vp & xh
+        if hp & high:
+            dist += 1
+        elif hn & high:
+            dist -= 1
+        hp = ((hp << 1) | 1) & mask
+        hn = (hn << 1) & mask
+        vp = (hn | ~(xv | hp)) & mask
+        vn = hp & xv
+    return dist
+
 try:
-    from rapidfuzz import fuzz
+    import numpy as np
+    from rapidfuzz import fuzz, process
+    _HAVE_RAPIDFUZZ = True
     def _ratio(a: str, b: str) -> float:
+        if a == b:
+            return 100.0
         return float(fuzz.token_sort_ratio(a, b))
-except Exception:
-    from difflib import SequenceMatcher
-    def _ratio(a: str, b: str) -> float:
-        return SequenceMatcher(None, a, b).ratio() * 100.0
+except ImportError:
+    _HAVE_RAPIDFUZZ = False
+    try:
+        from Levenshtein import ratio as _lev_ratio
+        def _ratio(a: str, b: str) -> float:
+            if a == b:
+                return 100.0
+            return _lev_ratio(a, b) * 100.0
+    except ImportError:
+        def _ratio(a: str, b: str) -> float:
+            if a == b:
+                return 100.0
+            return (1.0 - _levenshtein(a, b) / max(len(a), len(b))) * 100.0
+
+def _best_candidate(
+    title_clean: str,
+    artist_clean: str,
+    titles: List[str],
+    artists: List[str],
+    accept_threshold: float,
+) -> Tuple[int, float]:
+    """Index and score of the best 0.6*artist + 0.4*title candidate."""
+    if not _HAVE_RAPIDFUZZ:
+        scores = [
+            0.6 * (_ratio(artist_clean, a) if artist_clean else 0.0) + 0.4 * (_ratio(title_clean, t) if title_clean else 0.0)
+            for t, a in zip(titles, artists)
+        ]
+        best_i = max(range(len(scores)), key=scores.__getitem__)
+        return best_i, scores[best_i]
+    # Lowest per-field score that can still reach the threshold if the other field is a perfect 100;
+    # cdist zeroes anything below it, so hopeless candidates cost no full scoring
+    artist_cutoff = max(0.0, (accept_threshold - 40.0) / 0.6)
+    title_cutoff = max(0.0, (accept_threshold - 60.0) / 0.4)
+    a_scores = np.zeros(len(artists))
+    t_scores = np.zeros(len(titles))
+    if artist_clean:
+        a_scores = process.cdist([artist_clean], artists, scorer=fuzz.token_sort_ratio, score_cutoff=artist_cutoff, dtype=np.float64)[0]
+    if title_clean:
+        t_scores = process.cdist([title_clean], titles, scorer=fuzz.token_sort_ratio, score_cutoff=title_cutoff, dtype=np.float64)[0]
+    combined = 0.6 * a_scores + 0.4 * t_scores
+    best_i = int(combined.argmax())
+    return best_i, float(combined[best_i])
+
+_NON_ALNUM = re.compile(r"[^a-z0-9\s]+")
 
+# Memo lives for one script run (Streamlit re-executes the module on rerun); within a
+# run the same titles/artist names are cleaned for every candidate and favorite check
+@functools.lru_cache(maxsize=4096)
 def _clean(s: str) -> str:
-    s = s or ""
-    s = unicodedata.normalize("NFKD", s)
-    s = "".join(ch for ch in s if not unicodedata.combining(ch))
-    s = s.lower()
-    s = re.sub(r"[^a-z0-9\s]", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
-
-def _try_search_variants(sp: SpotifyClient, title: str, artist: str, limit: int = 10) -> List[dict]:
-    results: List[dict] = []
-    # Optional helpers
-    try:
-        results = sp.search_tracks_filtered(title=title, artist=artist, limit=limit) or []
-    except Exception:
-        results = []
-    if not results:
+    # NFKD + ASCII encode drops combining marks (and other non-ASCII) in one C-level pass
+    s = unicodedata.normalize("NFKD", s or "").encode("ascii", "ignore").decode("ascii").lower()
+    return " ".join(_NON_ALNUM.sub(" ", s).split())
+
+def _match_key(s: str) -> str:
+    """Dedupe/compare key: _clean(s), or the casefolded text when _clean strips it to nothing (non-Latin)."""
+    return _clean(s) or (s or "").strip().casefold()
+
+def _track_query(title: str, artist: str, quoted: bool = True) -> str:
+    """Build a `track:... artist:...` filter query (quoted or unquoted)."""
+    t = (title or "").strip()
+    a = (artist or "").strip()
+    if quoted:
+        parts = [f'track:"{t}"' if t else "", f'artist:"{a}"' if a else ""]
+    else:
+        parts = [f"track:{t}" if t else "", f"artist:{a}" if a else ""]
+    return " ".join(parts).strip()
+
+def _try_search_variants(
+    sp: SpotifyClient, title: str, artist: str, limit: int = 10, first_limit: int = 3
+) -> List[dict]:
+    t_first = " ".join((title or "").split()[:1])
+    a_first = " ".join((artist or "").split()[:1])
+    # Most to least specific; stop at the first query that returns anything.
+    # An exact track+artist filter rarely needs more than a few hits, so it asks for fewer.
+    variants = [
+        (_track_query(title, artist), first_limit),
+        (_track_query(title, artist, quoted=False), limit),
+        (" ".join([title or "", artist or ""]).strip(), limit),
+        (_track_query(title, ""), limit),
+        (_track_query("", artist), limit),
+        (_track_query(t_first, a_first), limit),
+    ]
+    seen_q = set()
+    error: Optional[Exception] = None
+    for q, q_limit in variants:
+        if not q or q in seen_q:
+            continue
+        seen_q.add(q)
         try:
-            q = " ".join([title or "", artist or ""]).strip()
-            if q:
-                results = sp.search_tracks_free(q, limit=limit) or []
-        except Exception:
-            results = []
-    # Fallbacks
-    if not results:
-        try: results = sp.search_track(title, artist, limit=limit) or []
-        except Exception: results = []
-    if not results and title:
-        try: results = sp.search_track(title, "", limit=limit) or []
-        except Exception: pass
-    if not results and artist:
-        try: results = sp.search_track("", artist, limit=limit) or []
-        except Exception: pass
-    if not results:
-        t_first = (title or "").split()[0] if title else ""
-        a_first = (artist or "").split()[0] if artist else ""
-        if t_first or a_first:
-            try: results = sp.search_track(t_first, a_first, limit=limit) or []
-            except Exception: pass
-    return results
+            results = sp.search_tracks_free(q, limit=q_limit) or []
+        except Exception as e:
+            error = e
+            continue
+        if results:
+            return results
+    # A failed search is not "no match"; let the caller see it
+    if error is not None:
+        raise error
+    return []
 
 def resolve_favorite_to_artist(
     sp: SpotifyClient,
@@ -243,32 +458,85 @@ def resolve_favorite_to_artist(
     artist: str,
     limit: int = 10,
     accept_threshold: float = 72.0,
-) -> Optional[Tuple[str, str, List[str]]]:
+) -> Optional[Tuple[str, str]]:
     title_clean = _clean(title)
     artist_clean = _clean(artist)
     candidates = _try_search_variants(sp, title, artist, limit=limit)
-    best_item = None
-    best_score = -1.0
-    for tr in candidates:
-        tr_title_clean = _clean(tr.get("name", ""))
-        artists = tr.get("artists") or []
-        lead_name_clean = _clean(artists[0].get("name", "")) if artists else ""
-        score_title = _ratio(title_clean, tr_title_clean) if title_clean else 0.0
-        score_artist = _ratio(artist_clean, lead_name_clean) if artist_clean else 0.0
-        score = 0.6 * score_artist + 0.4 * score_title
-        if score > best_score:
-            best_score = score
-            best_item = tr
-    if best_item is None or best_score < accept_threshold:
+    if not candidates:
         return None
+    titles = [_clean(tr.get("name", "")) for tr in candidates]
+    lead_names = [_clean((tr.get("artists") or [{}])[0].get("name", "")) for tr in candidates]
+    best_i, best_score = None, 0.0
+    if title_clean and artist_clean:
+        # Search usually returns the exact track; take it without fuzzy-scoring the rest
+        for i, (t, a) in enumerate(zip(titles, lead_names)):
+            if t == title_clean and a == artist_clean:
+                best_i, best_score = i, 100.0
+                break
+    if best_i is None:
+        best_i, best_score = _best_candidate(title_clean, artist_clean, titles, lead_names, accept_threshold)
+    if best_score < accept_threshold:
+        return None
+    best_item = candidates[best_i]
     artists = best_item.get("artists") or []
     aid = artists[0].get("id") if artists else None
-    adata = sp.get_artist(aid) if aid else {}
-    return (
-        aid or "",
-        adata.get("name") or (artists[0].get("name") if artists else ""),
-        adata.get("genres", []) or [],
-    )
+    return aid or "", (artists[0].get("name") if artists else "") or ""
+
+def _attach_genres(
+    sp: SpotifyClient,
+    artist_pairs: List[Tuple[str, str]],
+    failures: Optional[List[Exception]] = None,
+) -> List[Tuple[str, str, List[str]]]:
+    """Turn resolved (artist_id, name) pairs into (artist_id, name, genres) with one batched artist fetch."""
+    try:
+        adata = sp.get_artists_bulk(list(dict.fromkeys(aid for aid, _ in artist_pairs)))
+    except Exception as e:
+        if failures is not None:
+            failures.append(e)
+        adata = {}
+    return [
+        (aid, (adata.get(aid) or {}).get("name") or aname, (adata.get(aid) or {}).get("genres", []) or [])
+        for (aid, aname) in artist_pairs
+    ]
+
+def _unique_favorites(favorites: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Strip (title, artist) pairs, drop incomplete ones and repeats of the same _match_key pair."""
+    unique: Dict[Tuple[str, str], Tuple[str, str]] = {}
+    for (t, a) in favorites:
+        if t and a:
+            unique.setdefault((_match_key(t), _match_key(a)), (t.strip(), a.strip()))
+    return list(unique.values())
+
+# ---------- Concurrency helpers ----------
+MAX_WORKERS = 8
+
+def _parallel_map(fn: Callable, items: List, failures: Optional[List[Exception]] = None) -> List:
+    """Run `fn` over `items` on a thread pool; results keep input order, failures become None
+    (and their exceptions are appended to `failures` when given)."""
+    def _safe(item):
+        try:
+            return fn(item), None
+        except Exception as e:
+            return None, e
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(items))) as ex:
+        outcomes = list(ex.map(_safe, items))
+    if failures is not None:
+        failures.extend(e for _, e in outcomes if e is not None)
+    return [r for r, _ in outcomes]
+
+# ---------- Result caching ----------
+class _PartialResult(Exception):
+    """Raised out of a cached recommender when a lookup failed.
+
+    Streamlit doesn't cache exceptions, so the degraded result is handed back to the
+    caller without being stored and the next click retries the network.
+    """
+
+    def __init__(self, result):
+        super().__init__("some Spotify lookups failed")
+        self.result = result
 
 # ---------- Standard recommendations ----------
 def recommend_from_favorites(
@@ -278,40 +546,55 @@ def recommend_from_favorites(
     favorites: List[Tuple[str, str]],
     max_recs: int = 3,
 ) -> List[Tuple[str, str]]:
-    sp = SpotifyClient(client_id, client_secret, market=market or "US")
-    favorites = [(t.strip(), a.strip()) for (t, a) in favorites if t and a]
-    fav_keys = {(t.lower(), a.lower()) for (t, a) in favorites}
-    artist_infos: List[Tuple[str, str, List[str]]] = []
-    for (title, artist) in favorites:
-        try:
-            resolved = resolve_favorite_to_artist(sp, title, artist, limit=10, accept_threshold=72.0)
-            if resolved:
-                aid, aname, a_genres = resolved
-                if aid:
-                    artist_infos.append((aid, aname, a_genres))
-        except Exception:
-            continue
-    candidates: List[Tuple[str, str]] = []
-    for (aid, _aname, _g) in artist_infos:
-        try:
-            top = sp.get_artist_top_tracks(aid, limit=10)
-            for tr in top:
-                _, tname, _, pa_name, turl = SpotifyClient.extract_track_core(tr)
-                if not tname or not pa_name:
-                    continue
-                key = (tname.strip().lower(), pa_name.strip().lower())
-                if key in fav_keys:
-                    continue
-                candidates.append((f"{tname} — {pa_name}", turl or ""))
-        except Exception:
-            continue
-    seen, recs = set(), []
-    for (text, url) in candidates:
-        if text not in seen:
-            seen.add(text)
-            recs.append((text, url))
-        if len(recs) >= max_recs:
+    """Cached recommendations; a run where any lookup failed is returned but not cached."""
+    try:
+        return _recommend_from_favorites_cached(client_id, client_secret, market, favorites, max_recs)
+    except _PartialResult as e:
+        return e.result
+
+@st.cache_data(ttl=1800, show_spinner=False)
+def _recommend_from_favorites_cached(
+    client_id: str,
+    client_secret: str,
+    market: str,
+    favorites: List[Tuple[str, str]],
+    max_recs: int = 3,
+) -> List[Tuple[str, str]]:
+    sp = _get_spotify_client(client_id, client_secret, market or "US")
+    favorites = _unique_favorites(favorites)
+    fav_keys = frozenset((_match_key(t), _match_key(a)) for (t, a) in favorites)
+    failures: List[Exception] = []
+    resolved = _parallel_map(
+        lambda fav: resolve_favorite_to_artist(sp, fav[0], fav[1], limit=10, accept_threshold=72.0),
+        favorites,
+        failures,
+    )
+    # Two favorites by the same artist only need that artist's top tracks once
+    artist_infos: List[Tuple[str, str]] = list({r[0]: r for r in resolved if r and r[0]}.values())
+    # Insertion-ordered dedupe keyed on track id (URL if the id is missing)
+    unique: Dict[str, TrackCore] = {}
+    # Recs are taken in artist order, so the first artist usually fills them alone;
+    # only fan out to the rest when it doesn't. That fallback costs one extra sequential
+    # round trip compared with fetching every artist at once.
+    for batch in (artist_infos[:1], artist_infos[1:]):
+        if len(unique) >= max_recs:
             break
+        for top in _parallel_map(lambda info: sp.get_artist_top_tracks(info[0], limit=10), batch, failures):
+            if not top:
+                continue
+            try:
+                for tr in top:
+                    core = SpotifyClient.extract_track_core(tr)
+                    if not core.tname or not core.aname:
+                        continue
+                    if (_match_key(core.tname), _match_key(core.aname)) in fav_keys:
+                        continue
+                    unique.setdefault(core.tid or core.url, core)
+            except Exception:
+                continue
+    recs = [(f"{c.tname} — {c.aname}", c.url or "") for c in islice(unique.values(), max_recs)]
+    if failures:
+        raise _PartialResult(recs)
     return recs
 
 # ---------- Niche buckets ----------
@@ -324,9 +607,36 @@ def build_recommendation_buckets(
     artist_pop_max: int = 45,
     per_bucket: int = 5
 ) -> Dict[str, List[Tuple[str, str]]]:
-    sp = SpotifyClient(client_id, client_secret, market=market or "US")
-    favorites = [(t.strip(), a.strip()) for (t, a) in favorites if t and a]
-    fav_artist_infos: List[Tuple[str, str, List[str]]] = []
-    for (title, artist) in favorites:
-        try:
+    """Cached Niche buckets; a run where any lookup failed is returned but not cached."""
+    try:
+        return _build_recommendation_buckets_cached(
+            client_id, client_secret, market, favorites, track_pop_max, artist_pop_max, per_bucket
+        )
+    except _PartialResult as e:
+        return e.result
 
+@st.cache_data(ttl=1800, show_spinner=False)
+def _build_recommendation_buckets_cached(
+    client_id: str,
+    client_secret: str,
+    market: str,
+    favorites: List[Tuple[str, str]],
+    track_pop_max: int = 35,
+    artist_pop_max: int = 45,
+    per_bucket: int = 5
+) -> Dict[str, List[Tuple[str, str]]]:
+    sp = _get_spotify_client(client_id, client_secret, market or "US")
+    favorites = _unique_favorites(favorites)
+    failures: List[Exception] = []
+    resolved = _parallel_map(
+        lambda fav: resolve_favorite_to_artist(sp, fav[0], fav[1], limit=10, accept_threshold=72.0),
+        favorites,
+        failures,
+    )
+    # Genres drive the Niche buckets; fetch them for every favorite artist in one request
+    fav_artist_infos: List[Tuple[str, str, List[str]]] = _attach_genres(
+        sp, list({r[0]: r for r in resolved if r and r[0]}.values()), failures
+    )
+    if failures:
+        # Never cache a run where a lookup failed (see _PartialResult)
+        raise _PartialResult(None)